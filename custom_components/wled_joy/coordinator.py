@@ -5,6 +5,7 @@ from __future__ import annotations
 from wled import (
     WLED,
     Device as WLEDDevice,
+    Preset,
     Releases,
     WLEDConnectionClosedError,
     WLEDError,
@@ -45,6 +46,7 @@ class WLEDDataUpdateCoordinator(DataUpdateCoordinator[WLEDDevice]):
         )
         self.wled = WLED(entry.data[CONF_HOST], session=async_get_clientsession(hass))
         self.unsub: CALLBACK_TYPE | None = None
+        self._effect_list_cache: tuple[dict[int, Preset], list[str]] | None = None
 
         super().__init__(
             hass,
@@ -61,6 +63,22 @@ class WLEDDataUpdateCoordinator(DataUpdateCoordinator[WLEDDevice]):
             self.data is not None and len(self.data.state.segments) > 1
         )
 
+    @callback
+    def async_effect_list_names(self) -> list[str]:
+        """Return the preset names, shared by all segment lights.
+
+        The list is rebuilt only when the device reports a new set of presets.
+        The same list object is handed to every caller, it must not be mutated.
+        """
+        presets = self.data.presets
+        cache = self._effect_list_cache
+        if cache is None or cache[0] is not presets:
+            cache = self._effect_list_cache = (
+                presets,
+                [preset.name for preset in presets.values()],
+            )
+        return cache[1]
+
     @callback
     def _use_websocket(self) -> None:
         """Use WebSocket for updates, instead of polling."""
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from functools import partial
+from collections.abc import Callable
+from functools import cached_property, partial
+from operator import attrgetter
 from typing import Any, cast
 import math
 import logging
 
+from wled import LightCapability
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -46,6 +49,19 @@ from .helpers import kelvin_to_255, kelvin_to_255_reverse, wled_exception_handle
 
 PARALLEL_UPDATES = 1
 
+_GET_STATE = attrgetter("coordinator.data.state")
+
+_MIN_MIREDS = kelvin_to_mired(COLOR_TEMP_K_MIN)
+_MAX_MIREDS = kelvin_to_mired(COLOR_TEMP_K_MAX)
+
+# Supported color modes per light capability, shared by all segment lights.
+# These must be plain sets, HA derives new sets from them with set methods;
+# entities must not mutate the shared set.
+_SUPPORTED_COLOR_MODES: dict[LightCapability, set[ColorMode]] = {
+    capability: set(color_modes)
+    for capability, color_modes in LIGHT_CAPABILITIES_COLOR_MODE_MAPPING.items()
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -68,6 +84,39 @@ async def async_setup_entry(
     update_segments()
 
 
+def _transition(kwargs: dict[str, Any]) -> int | None:
+    """Return the requested transition in WLED units, if any."""
+    if (transition := kwargs.get(ATTR_TRANSITION)) is None:
+        return None
+    # WLED uses 100ms per unit, so 10 = 1 second.
+    return round(transition * 10)
+
+
+def _mireds_to_primary(value: int) -> tuple[int, int, int]:
+    """Convert a color temperature in mireds to a primary RGB color."""
+    return convert_K_to_RGB(mired_to_kelvin(value))
+
+
+def _kelvin_to_cct(value: int) -> int:
+    """Convert a color temperature in K to the segment CCT."""
+    return kelvin_to_255(value, COLOR_TEMP_K_MIN, COLOR_TEMP_K_MAX)
+
+
+# Segment light turn on attributes: the segment payload key they map to, an
+# optional value converter and the color mode the light switches to.
+# Transitions are handled separately, as they may move to the main light.
+_TURN_ON_ATTRIBUTES: dict[
+    str, tuple[str, Callable[[Any], Any] | None, ColorMode | None]
+] = {
+    ATTR_RGB_COLOR: (ATTR_COLOR_PRIMARY, None, ColorMode.RGB),
+    ATTR_RGBW_COLOR: (ATTR_COLOR_PRIMARY, None, ColorMode.RGBW),
+    ATTR_COLOR_TEMP: (ATTR_COLOR_PRIMARY, _mireds_to_primary, ColorMode.COLOR_TEMP),
+    ATTR_COLOR_TEMP_KELVIN: (ATTR_CCT, _kelvin_to_cct, None),
+    ATTR_BRIGHTNESS: (ATTR_BRIGHTNESS, None, None),
+    ATTR_EFFECT: (ATTR_EFFECT, None, None),
+}
+
+
 class WLEDMainLight(WLEDEntity, LightEntity):
     """Defines a WLED main light."""
 
@@ -99,20 +148,14 @@ class WLEDMainLight(WLEDEntity, LightEntity):
     @wled_exception_handler
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
-        transition = None
-        if ATTR_TRANSITION in kwargs:
-            # WLED uses 100ms per unit, so 10 = 1 second.
-            transition = round(kwargs[ATTR_TRANSITION] * 10)
+        transition = _transition(kwargs)
 
         await self.coordinator.wled.master(on=False, transition=transition)
 
     @wled_exception_handler
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
-        transition = None
-        if ATTR_TRANSITION in kwargs:
-            # WLED uses 100ms per unit, so 10 = 1 second.
-            transition = round(kwargs[ATTR_TRANSITION] * 10)
+        transition = _transition(kwargs)
 
         await self.coordinator.wled.master(
             on=True, brightness=kwargs.get(ATTR_BRIGHTNESS), transition=transition
@@ -126,8 +169,8 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
     _attr_translation_key = "segment"
     _attr_min_color_temp_kelvin = COLOR_TEMP_K_MIN
     _attr_max_color_temp_kelvin = COLOR_TEMP_K_MAX
-    _attr_min_mireds = kelvin_to_mired(COLOR_TEMP_K_MIN)
-    _attr_max_mireds = kelvin_to_mired(COLOR_TEMP_K_MAX)
+    _attr_min_mireds = _MIN_MIREDS
+    _attr_max_mireds = _MAX_MIREDS
 
     def __init__(
         self,
@@ -151,38 +194,41 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
         )
 
         if (
-            coordinator.data.info.leds.segment_light_capabilities is not None
-            and (
-                color_modes := LIGHT_CAPABILITIES_COLOR_MODE_MAPPING.get(
-                    coordinator.data.info.leds.segment_light_capabilities[segment]
-                )
+            capabilities := coordinator.data.info.leds.segment_light_capabilities
+        ) is not None and (
+            color_modes := LIGHT_CAPABILITIES_COLOR_MODE_MAPPING.get(
+                capability := capabilities[segment]
             )
-            is not None
-        ):
+        ) is not None:
             self._attr_color_mode = color_modes[0]
-            self._attr_supported_color_modes = set(color_modes)
+            self._attr_supported_color_modes = _SUPPORTED_COLOR_MODES[capability]
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        try:
-            self.coordinator.data.state.segments[self._segment]
-        except KeyError:
+        if self._segment not in _GET_STATE(self).segments:
             return False
 
         return super().available
 
-    @property
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        for name in _SEGMENT_CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+        super()._handle_coordinator_update()
+
+    @cached_property
     def rgb_color(self) -> tuple[int, int, int] | None:
         """Return the color value."""
-        if not (color := self.coordinator.data.state.segments[self._segment].color):
+        if not (color := _GET_STATE(self).segments[self._segment].color):
             return None
         return color.primary[:3]
 
-    @property
+    @cached_property
     def rgbw_color(self) -> tuple[int, int, int, int] | None:
         """Return the color value."""
-        if not (color := self.coordinator.data.state.segments[self._segment].color):
+        if not (color := _GET_STATE(self).segments[self._segment].color):
             return None
         return cast(tuple[int, int, int, int], color.primary)
 
@@ -194,43 +240,43 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
         else :
             return 300
 
-    @property
+    @cached_property
     def color_temp_kelvin(self) -> int | None:
         """Return the CT color value in K."""
-        cct = self.coordinator.data.state.segments[self._segment].cct
+        cct = _GET_STATE(self).segments[self._segment].cct
         return kelvin_to_255_reverse(cct, COLOR_TEMP_K_MIN, COLOR_TEMP_K_MAX)
 
-    @property
+    @cached_property
     def effect(self) -> str | None:
         """Return the current effect of the light."""
-        return self.coordinator.data.effects[
-            int(self.coordinator.data.state.segments[self._segment].effect_id)
-        ].name
+        data = self.coordinator.data
+        # The WLED client types effect_id as int | str, the cast narrows it and
+        # turns numeric strings into keys of the int-keyed effects mapping.
+        return data.effects[int(data.state.segments[self._segment].effect_id)].name
 
-    @property
+    @cached_property
     def brightness(self) -> int | None:
         """Return the brightness of this light between 1..255."""
-        state = self.coordinator.data.state
+        state = _GET_STATE(self)
+        segment = state.segments[self._segment]
 
         # If this is the one and only segment, calculate brightness based
         # on the main and segment brightness
         if not self.coordinator.has_main_light:
-            return int(
-                (state.segments[self._segment].brightness * state.brightness) / 255
-            )
+            return (segment.brightness * state.brightness) // 255
 
-        return state.segments[self._segment].brightness
+        return segment.brightness
 
-    @property
+    @cached_property
     def effect_list(self) -> list[str]:
         """Return the list of supported effects."""
         # return [effect.name for effect in self.coordinator.data.effects.values()]
-        return [preset.name for preset in self.coordinator.data.presets.values()]
+        return self.coordinator.async_effect_list_names()
     
-    @property
+    @cached_property
     def is_on(self) -> bool:
         """Return the state of the light."""
-        state = self.coordinator.data.state
+        state = _GET_STATE(self)
 
         # If there is no main, we take the main state into account
         # on the segment level.
@@ -242,10 +288,7 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
     @wled_exception_handler
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the light."""
-        transition = None
-        if ATTR_TRANSITION in kwargs:
-            # WLED uses 100ms per unit, so 10 = 1 second.
-            transition = round(kwargs[ATTR_TRANSITION] * 10)
+        transition = _transition(kwargs)
 
         # If there is no main control, and only 1 segment, handle the main
         if not self.coordinator.has_main_light:
@@ -264,37 +307,26 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
             ATTR_SEGMENT_ID: self._segment,
         }
 
-        if ATTR_RGB_COLOR in kwargs:
-            data[ATTR_COLOR_PRIMARY] = kwargs[ATTR_RGB_COLOR]
-            self._attr_color_mode = ColorMode.RGB
-
-        if ATTR_RGBW_COLOR in kwargs:
-            data[ATTR_COLOR_PRIMARY] = kwargs[ATTR_RGBW_COLOR]
-            self._attr_color_mode = ColorMode.RGBW
-
-        if ATTR_COLOR_TEMP in kwargs:       
-            data[ATTR_COLOR_PRIMARY] = convert_K_to_RGB(mired_to_kelvin((kwargs[ATTR_COLOR_TEMP])))
+        # Only walk the attributes actually passed, HA rarely sends more
+        # than one or two of them.
+        for attr, value in kwargs.items():
+            if (entry := _TURN_ON_ATTRIBUTES.get(attr)) is None:
+                continue
+            key, convert, color_mode = entry
+            data[key] = value if convert is None else convert(value)
+            if color_mode is not None:
+                self._attr_color_mode = color_mode
+
+        if ATTR_COLOR_TEMP in kwargs:
             self._ct = kwargs[ATTR_COLOR_TEMP]
-            self._attr_color_mode = ColorMode.COLOR_TEMP
-
-        if ATTR_COLOR_TEMP_KELVIN in kwargs:
-            data[ATTR_CCT] = kelvin_to_255(
-                kwargs[ATTR_COLOR_TEMP_KELVIN], COLOR_TEMP_K_MIN, COLOR_TEMP_K_MAX
-            )
 
-        if ATTR_TRANSITION in kwargs:
-            # WLED uses 100ms per unit, so 10 = 1 second.
-            data[ATTR_TRANSITION] = round(kwargs[ATTR_TRANSITION] * 10)
+        if (transition := _transition(kwargs)) is not None:
+            data[ATTR_TRANSITION] = transition
 
-        if ATTR_BRIGHTNESS in kwargs:
-            data[ATTR_BRIGHTNESS] = kwargs[ATTR_BRIGHTNESS]
+        if (effect := data.get(ATTR_EFFECT)) is not None and effect != 'Solid':
+            await self.coordinator.wled.preset(preset=effect)
+            return
 
-        if ATTR_EFFECT in kwargs:
-            data[ATTR_EFFECT] = kwargs[ATTR_EFFECT]
-            if kwargs[ATTR_EFFECT] != 'Solid' :
-                await self.coordinator.wled.preset(preset=kwargs[ATTR_EFFECT])
-                return    
-            
         # If there is no main control, and only 1 segment, handle the main
         if not self.coordinator.has_main_light:
             main_data = {ATTR_ON: True}
@@ -313,6 +345,15 @@ class WLEDSegmentLight(WLEDEntity, LightEntity):
         await self.coordinator.wled.segment(**data)
 
 
+# Segment light properties derived purely from coordinator data, these are
+# cached between coordinator updates.
+_SEGMENT_CACHED_PROPERTIES = tuple(
+    name
+    for name, value in vars(WLEDSegmentLight).items()
+    if isinstance(value, cached_property)
+)
+
+
 @callback
 def async_update_segments(
     coordinator: WLEDDataUpdateCoordinator,
@@ -325,6 +366,13 @@ def async_update_segments(
         for light in coordinator.data.state.segments.values()
         if light.segment_id is not None
     }
+
+    # Nothing to add when all segments are known already; in that case a main
+    # light has been added before as well, if one was needed. Past this point
+    # there is always at least one new segment light.
+    if segment_ids <= current_ids:
+        return
+
     new_entities: list[WLEDMainLight | WLEDSegmentLight] = []
 
     # More than 1 segment now? No main? Add main controls
@@ -341,17 +389,14 @@ def async_update_segments(
     async_add_entities(new_entities)
 
 
-def convert_K_to_RGB(colour_temperature):
+def _compute_K_to_RGB(colour_temperature):
     """
     Converts from K to RGB, algorithm courtesy of 
     http://www.tannerhelland.com/4435/convert-temperature-rgb-algorithm-code/
     """
     #range check
-    if colour_temperature < 1000: 
-        colour_temperature = 1000
-    elif colour_temperature > 40000:
-        colour_temperature = 40000
-    
+    colour_temperature = max(1000, min(40000, colour_temperature))
+
     tmp_internal = colour_temperature / 100.0
     
     # red 
@@ -359,30 +404,14 @@ def convert_K_to_RGB(colour_temperature):
         red = 255
     else:
         tmp_red = 329.698727446 * math.pow(tmp_internal - 60, -0.1332047592)
-        if tmp_red < 0:
-            red = 0
-        elif tmp_red > 255:
-            red = 255
-        else:
-            red = tmp_red
+        red = max(0.0, min(255.0, tmp_red))
     
     # green
     if tmp_internal <=66:
         tmp_green = 99.4708025861 * math.log(tmp_internal) - 161.1195681661
-        if tmp_green < 0:
-            green = 0
-        elif tmp_green > 255:
-            green = 255
-        else:
-            green = tmp_green
     else:
         tmp_green = 288.1221695283 * math.pow(tmp_internal - 60, -0.0755148492)
-        if tmp_green < 0:
-            green = 0
-        elif tmp_green > 255:
-            green = 255
-        else:
-            green = tmp_green
+    green = max(0.0, min(255.0, tmp_green))
     
     # blue
     if tmp_internal >=66:
@@ -391,11 +420,17 @@ def convert_K_to_RGB(colour_temperature):
         blue = 0
     else:
         tmp_blue = 138.5177312231 * math.log(tmp_internal - 10) - 305.0447927307
-        if tmp_blue < 0:
-            blue = 0
-        elif tmp_blue > 255:
-            blue = 255
-        else:
-            blue = tmp_blue
+        blue = max(0.0, min(255.0, tmp_blue))
     
     return (round(red), round(green), round(blue))
+
+
+# Lookup table of the above in 10 K steps over the clamped 1000..40000 K range
+_K_TO_RGB: tuple[tuple[int, int, int], ...] = tuple(
+    _compute_K_to_RGB(k) for k in range(1000, 40001, 10)
+)
+
+
+def convert_K_to_RGB(colour_temperature: float) -> tuple[int, int, int]:
+    """Convert a color temperature in K to RGB using the lookup table."""
+    return _K_TO_RGB[min(max(round(colour_temperature / 10) - 100, 0), 3900)]
@@ -0,0 +1 @@
+"""Tests for the WLED JOY integration."""
@@ -0,0 +1,45 @@
+"""Tests for the WLED JOY light platform."""
+
+from types import SimpleNamespace
+
+from wled import LightCapability
+
+from homeassistant.components.light import ATTR_EFFECT, ColorMode
+
+from custom_components.wled_joy.light import WLEDSegmentLight
+
+
+def _mock_coordinator(capability: LightCapability) -> SimpleNamespace:
+    """Return a coordinator stand-in with a single segment that is on."""
+    segment = SimpleNamespace(
+        brightness=255,
+        cct=127,
+        color=SimpleNamespace(primary=(255, 0, 0, 0)),
+        effect_id=0,
+        on=True,
+        segment_id=0,
+    )
+    return SimpleNamespace(
+        data=SimpleNamespace(
+            effects={0: SimpleNamespace(name="Solid")},
+            info=SimpleNamespace(
+                leds=SimpleNamespace(segment_light_capabilities=[capability]),
+                mac_address="aabbccddeeff",
+            ),
+            presets={},
+            state=SimpleNamespace(brightness=255, on=True, segments={0: segment}),
+        ),
+        has_main_light=True,
+    )
+
+
+def test_segment_light_state_attributes_when_on() -> None:
+    """Test the state attributes of a segment light that is on with an effect."""
+    light = WLEDSegmentLight(_mock_coordinator(LightCapability.RGB_COLOR), 0)
+
+    assert isinstance(light.supported_color_modes, set)
+    assert light.color_mode == ColorMode.RGB
+
+    attributes = light.state_attributes
+    assert attributes is not None
+    assert attributes[ATTR_EFFECT] == "Solid"